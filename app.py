@@ -1,4 +1,5 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
@@ -13,7 +14,7 @@ sys.path.append(str(Path(__file__).parent))
 
 from database import SessionLocal, User, Transaction, Loan, FixedExpense, PlaidItem, CategoryBudget, NetWorthSnapshot, init_db
 from process_transactions import process_files, save_to_db
-from plaid_integration import create_link_token, exchange_public_token, fetch_transactions
+from plaid_integration import create_link_token, exchange_public_token, fetch_transactions_many
 from dashboard import _prep, _kpis, cat_spend, income_vs_expense_monthly, net_worth_trend
 from loans import _prep_loans, simulate_payoff
 from insights import (
@@ -23,6 +24,8 @@ from insights import (
     detect_anomalies,
     filter_by_timeframe,
     generate_actionable_tips,
+    insights_bundle,
+    month_summary,
     predict_spending,
     summarize_budget_watch,
 )
@@ -492,80 +495,98 @@ def upsert_plaid_item(item_id: str, access_token: str, institution_name: str = "
 
 
 def sync_plaid_transactions(item: PlaidItem, share_with_family: bool = True):
+    return sync_plaid_items([item], share_with_family=share_with_family)
+
+
+def sync_plaid_items(items: list[PlaidItem], share_with_family: bool = True):
+    """Sync several linked items, fetching each round of pages from Plaid concurrently."""
     db = get_db()
     total_new = 0
-    cursor = item.cursor
-    latest_cursor = cursor
-    has_more = True
-
-    while has_more:
-        resp_data = fetch_transactions(item.access_token, cursor=cursor)
-
-        added = resp_data.get("added", [])
-        has_more = resp_data.get("has_more", False)
-        latest_cursor = resp_data.get("next_cursor", latest_cursor)
-        cursor = latest_cursor
-
-        for t in added:
-            plaid_id = t.get("transaction_id")
-            if plaid_id and db.query(Transaction).filter(Transaction.plaid_transaction_id == plaid_id).first():
-                continue
-
-            category_list = t.get("category") or []
-            pf_category = None
-            if t.get("personal_finance_category"):
-                pf_category = t["personal_finance_category"].get("primary")
-            category_value = pf_category or (category_list[0] if category_list else "Uncategorized")
-
-            # Plaid convention: Positive = Expense, Negative = Income
-            # Our App convention: Positive = Income, Negative = Expense
-            raw_amount = t.get("amount", 0)
-            signed_amount = -raw_amount
-
-            new_txn = Transaction(
-                date=pd.to_datetime(t.get("date")).date(),
-                description=t.get("name", "Plaid Transaction"),
-                amount=signed_amount,
-                category=category_value or "Uncategorized",
-                source="plaid",
-                plaid_transaction_id=plaid_id,
-                is_shared=share_with_family,
-            )
-            db.add(new_txn)
-            total_new += 1
-
-        db.commit()
+    cursors = {item.id: item.cursor for item in items}
+    pending = list(items)
+
+    while pending:
+        responses = fetch_transactions_many([(item.access_token, cursors[item.id]) for item in pending])
+
+        still_pending = []
+        for item, resp_data in zip(pending, responses):
+            cursors[item.id] = resp_data.get("next_cursor", cursors[item.id])
+            if resp_data.get("has_more", False):
+                still_pending.append(item)
+            total_new += _store_plaid_transactions(db, resp_data.get("added", []), share_with_family)
+            db.commit()
+        pending = still_pending
 
-    item.cursor = latest_cursor
-    item.last_synced_at = datetime.utcnow()
+    synced_at = datetime.utcnow()
+    for item in items:
+        item.cursor = cursors[item.id]
+        item.last_synced_at = synced_at
     db.commit()
     return total_new
 
 
-def compute_budget_status(df_prep: pd.DataFrame, budgets: list[CategoryBudget]):
+def _store_plaid_transactions(db, added, share_with_family: bool):
+    new_count = 0
+    for t in added:
+        plaid_id = t.get("transaction_id")
+        if plaid_id and db.query(Transaction).filter(Transaction.plaid_transaction_id == plaid_id).first():
+            continue
+
+        category_list = t.get("category") or []
+        pf_category = None
+        if t.get("personal_finance_category"):
+            pf_category = t["personal_finance_category"].get("primary")
+        category_value = pf_category or (category_list[0] if category_list else "Uncategorized")
+
+        # Plaid convention: Positive = Expense, Negative = Income
+        # Our App convention: Positive = Income, Negative = Expense
+        raw_amount = t.get("amount", 0)
+        signed_amount = -raw_amount
+
+        new_txn = Transaction(
+            date=pd.to_datetime(t.get("date")).date(),
+            description=t.get("name", "Plaid Transaction"),
+            amount=signed_amount,
+            category=category_value or "Uncategorized",
+            source="plaid",
+            plaid_transaction_id=plaid_id,
+            is_shared=share_with_family,
+        )
+        db.add(new_txn)
+        new_count += 1
+    return new_count
+
+
+def compute_budget_status(df_prep: pd.DataFrame, budgets: list[CategoryBudget], summary=None):
     if df_prep.empty or not budgets:
         return []
 
     current_month = str(pd.Timestamp.today().strftime("%Y-%m"))
-    month_df = df_prep[df_prep["Month"] == current_month]
-    expenses = month_df[month_df["Amount"] < 0].copy()
-    spent_by_cat = expenses.groupby("Category")["Amount"].sum().abs()
-
-    status = []
-    for budget in budgets:
-        limit = float(budget.monthly_limit or 0)
-        spent = float(spent_by_cat.get(budget.category, 0))
-        remaining = limit - spent
-        pct = spent / limit if limit > 0 else 0
-        status.append({
-            "category": budget.category,
+    # Reuse the latest-month aggregates when they cover the calendar month
+    if summary is None or summary.month != current_month:
+        summary = month_summary(df_prep, current_month)
+    spent_by_cat = summary.by_category["Spend"].abs()
+
+    # Work on whole arrays and convert to Python floats once via tolist()
+    categories = [budget.category for budget in budgets]
+    limits = np.array([budget.monthly_limit or 0 for budget in budgets], dtype=float)
+    spent = spent_by_cat.reindex(categories, fill_value=0.0).to_numpy(dtype=float)
+    remaining = limits - spent
+    pct = np.divide(spent, limits, out=np.zeros_like(spent), where=limits > 0)
+
+    return [
+        {
+            "category": category,
             "limit": limit,
-            "spent": spent,
-            "remaining": remaining,
-            "pct": pct,
-            "is_over": remaining < 0,
-        })
-    return status
+            "spent": spent_value,
+            "remaining": remaining_value,
+            "pct": pct_value,
+            "is_over": remaining_value < 0,
+        }
+        for category, limit, spent_value, remaining_value, pct_value in zip(
+            categories, limits.tolist(), spent.tolist(), remaining.tolist(), pct.tolist()
+        )
+    ]
 
 # --- Main App ---
 current_role = st.session_state.get("role") or "family"
@@ -652,6 +673,15 @@ Last sync: {last_sync}")
                             st.rerun()
                         except Exception as e:
                             st.error(f"Plaid sync failed: {e}")
+            if len(plaid_items) > 1 and st.button("Sync all banks", key="sync_all_plaid"):
+                with st.spinner("Syncing transactions..."):
+                    try:
+                        new_count = sync_plaid_items(plaid_items, share_with_family=share_default)
+                        st.success(f"Pulled {new_count} new transactions.")
+                        time.sleep(1)
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Plaid sync failed: {e}")
         else:
             st.caption("No banks linked yet.")
 
@@ -714,7 +744,8 @@ with st.sidebar:
 window_label = st.session_state["analysis_window"]
 analysis_df, window_bounds = filter_by_timeframe(df_prep, window_label)
 
-budget_status = compute_budget_status(analysis_df, visible_budgets)
+insights_cache = insights_bundle(analysis_df)
+budget_status = compute_budget_status(analysis_df, visible_budgets, summary=insights_cache.summary)
 fixed_expense_rows = db_session.query(FixedExpense).with_entities(FixedExpense.amount).all()
 fixed_expenses_total_value = sum([x[0] for x in fixed_expense_rows])
 
@@ -1071,7 +1102,7 @@ with tab5:
             st.info("No data in the selected window. Try expanding the timeframe.")
             st.stop()
 
-        highlights = compute_highlights(filtered_df)
+        highlights = compute_highlights(filtered_df, summary=insights_cache.summary)
         st.subheader("Highlights")
         h1, h2, h3, h4 = st.columns(4)
         h1.metric("Income", f"${highlights['income']:,.0f}", help=f"Latest month: {highlights['month']}")
@@ -1081,8 +1112,8 @@ with tab5:
         top_val = highlights.get("top_category_spend", 0)
         h4.metric("Top Category", top_cat, delta=f"-${top_val:,.0f}" if top_cat != "—" else None)
 
-        anomalies = detect_anomalies(filtered_df)
-        forecast = predict_spending(filtered_df)
+        anomalies = detect_anomalies(filtered_df, cache=insights_cache)
+        forecast = predict_spending(filtered_df, cache=insights_cache)
 
         st.subheader("Actionable Tips")
         tips = generate_actionable_tips(
@@ -1092,6 +1123,7 @@ with tab5:
             forecast=forecast,
             fixed_expenses_total=fixed_expenses_total_value,
             window_label=window_label,
+            summary=insights_cache.summary,
         )
         if tips:
             for tip in tips:
@@ -1144,6 +1176,7 @@ with tab5:
                 anomalies,
                 tips=tips,
                 window_label=window_label,
+                summary=insights_cache.summary,
             )
             formatted_response = response.replace("\n", "<br>")
             st.markdown(
@@ -16,6 +16,8 @@ def _prep(df):
     
     df = df.copy()
     df['Date'] = pd.to_datetime(df['Date'])
+    # Keep rows in date order so month lookups can binary-search
+    df = df.sort_values('Date', kind='stable')
     df['Month'] = df['Date'].dt.to_period('M').astype(str)
     
     # Ensure Amount is numeric
@@ -30,7 +32,14 @@ def _prep(df):
         df["Category"] = "Uncategorized"
     else:
         df["Category"] = df["Category"].fillna("Uncategorized").replace("", "Uncategorized")
-        
+
+    # Categorical keys let every downstream groupby hash small integer codes
+    # instead of strings. Month is ordered so max()/sorting stay chronological.
+    df['Month'] = df['Month'].astype('category').cat.as_ordered()
+    df['Category'] = df['Category'].astype('category')
+    if 'Description' in df.columns:
+        df['Description'] = df['Description'].astype('category')
+
     return df
 
 def _kpis(
@@ -102,7 +111,7 @@ def income_vs_expense_monthly(df):
     Bar chart of Income vs Expenses per month.
     """
     # Group by Month and Type (Pos/Neg)
-    monthly = df.groupby('Month')['Amount'].agg(
+    monthly = df.groupby('Month', observed=True)['Amount'].agg(
         Income=lambda x: x[x > 0].sum(),
         Expense=lambda x: abs(x[x < 0].sum())
     ).reset_index()
@@ -123,7 +132,7 @@ def cat_spend(df):
     spend_df['Category'] = spend_df['Category'].fillna('Uncategorized').replace('', 'Uncategorized')
     spend_df['Amount'] = abs(spend_df['Amount'])
     
-    by_cat = spend_df.groupby('Category')['Amount'].sum().reset_index()
+    by_cat = spend_df.groupby('Category', sort=False, observed=True)['Amount'].sum().reset_index()
     
     fig = px.pie(by_cat, values='Amount', names='Category', hole=0.4, title="Spending by Category")
     fig.update_traces(textposition='inside', textinfo='percent+label')
@@ -1,80 +1,181 @@
 import pickle
+import re
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+# Descriptions that look like subscriptions or automatic payments
+_RECURRING_RE = re.compile(r"subscr|auto|recurring", re.IGNORECASE)
 
-def compute_highlights(df):
+
+class MonthSummary(NamedTuple):
+    """Aggregates for a single month, shared by highlights, tips and budgets."""
+
+    month: str
+    month_df: pd.DataFrame
+    expense_rows: pd.DataFrame
+    income: float
+    expenses: float
+    # Per-category net ("Amount") and expense-only ("Spend") totals plus
+    # the number of priced rows ("Rows").
+    by_category: pd.DataFrame
+
+
+def _month_rows(df: pd.DataFrame, month) -> pd.DataFrame:
+    """Rows for ``month``, located by binary search when Month is sorted."""
+
+    months = df["Month"]
+    if not months.is_monotonic_increasing:
+        return df[months == month]
+    if isinstance(months.dtype, pd.CategoricalDtype) and month not in months.cat.categories:
+        return df.iloc[:0]
+
+    start = months.searchsorted(month, side="left")
+    end = months.searchsorted(month, side="right")
+    return df.iloc[start:end]
+
+
+def month_summary(df: pd.DataFrame, month=None) -> Optional[MonthSummary]:
+    """Filter and group one month (the latest by default) in a single pass."""
+
+    if df.empty:
+        return None
+
+    if month is None:
+        month = df["Month"].max()
+    month_df = _month_rows(df, month)
+
+    # One pass over the raw amounts for both sign masks and both totals
+    amounts = month_df["Amount"].to_numpy(dtype=np.float64, na_value=np.nan)
+    is_expense = amounts < 0
+    expense_rows = month_df[is_expense]
+    by_category = (
+        month_df.assign(Spend=np.where(is_expense, amounts, 0.0), Rows=~np.isnan(amounts))
+        .groupby("Category", sort=False, observed=True)[["Amount", "Spend", "Rows"]]
+        .sum()
+    )
+
+    return MonthSummary(
+        month=month,
+        month_df=month_df,
+        expense_rows=expense_rows,
+        income=float(amounts[amounts > 0].sum()),
+        expenses=float(amounts[is_expense].sum()),
+        by_category=by_category,
+    )
+
+
+def _monthly_spend(expenses: pd.DataFrame) -> pd.Series:
+    """Absolute expense total per Month."""
+
+    return expenses.groupby("Month", sort=False, observed=True)["Amount"].sum().abs()
+
+
+class InsightsCache(NamedTuple):
+    """Shared slices and rollups for one render of the insights page."""
+
+    summary: Optional[MonthSummary]
+    expenses: pd.DataFrame
+    monthly_spend: pd.Series
+
+
+def insights_bundle(df: pd.DataFrame) -> InsightsCache:
+    """Compute the expense slice and monthly rollups once for every insight."""
+
+    if df.empty:
+        # Same shape as _monthly_spend's result so consumers can reset_index on it
+        empty_spend = pd.Series(dtype=float, index=pd.Index([], name="Month"), name="Amount")
+        return InsightsCache(summary=None, expenses=df, monthly_spend=empty_spend)
+
+    expenses = df.loc[df["Amount"] < 0]
+    return InsightsCache(
+        summary=month_summary(df),
+        expenses=expenses,
+        monthly_spend=_monthly_spend(expenses),
+    )
+
+
+def _repeated_charges(expenses: pd.DataFrame) -> pd.DataFrame:
+    """First row of every (Description, Amount) pair that occurs more than once."""
+
+    if expenses.empty:
+        return expenses
+
+    keys = ["Description", "Amount"]
+    repeated = expenses.duplicated(subset=keys, keep=False) & expenses["Description"].notna()
+    return expenses[repeated].drop_duplicates(subset=keys)
+
+
+def compute_highlights(df, summary: Optional[MonthSummary] = None):
     """Summarize the latest month of data for quick highlights."""
 
     if df.empty:
         return {}
 
-    latest_month = df["Month"].max()
-    month_df = df[df["Month"] == latest_month]
+    if summary is None:
+        summary = month_summary(df)
 
-    income = month_df[month_df["Amount"] > 0]["Amount"].sum()
-    expenses = month_df[month_df["Amount"] < 0]["Amount"].sum()
+    income = summary.income
+    expenses = summary.expenses
     net_cashflow = income + expenses
 
-    expense_rows = month_df[month_df["Amount"] < 0]
+    expense_rows = summary.expense_rows
     top_category = None
     top_category_spend = 0
     if not expense_rows.empty:
-        by_cat = expense_rows.groupby("Category")["Amount"].sum().abs().sort_values(ascending=False)
+        by_cat = summary.by_category["Spend"].abs().nlargest(1)
         if not by_cat.empty:
             top_category = by_cat.index[0]
             top_category_spend = by_cat.iloc[0]
 
     return {
-        "month": latest_month,
+        "month": summary.month,
         "income": float(income),
         "spend": float(abs(expenses)),
         "net": float(net_cashflow),
         "top_category": top_category,
         "top_category_spend": float(top_category_spend),
-        "avg_ticket": float(abs(expense_rows["Amount"].mean())) if not expense_rows.empty else 0.0,
+        "avg_ticket": abs(expenses) / len(expense_rows) if len(expense_rows) else 0.0,
     }
 
-def detect_anomalies(df, lookback_months: int = 6):
+def detect_anomalies(df, lookback_months: int = 6, cache: Optional[InsightsCache] = None):
     """Surface unusually large expenses using a z-score over recent data."""
 
     if df.empty:
         return pd.DataFrame()
 
-    df = df.copy()
+    expenses = cache.expenses if cache is not None else df.loc[df["Amount"] < 0]
+    # float32 is plenty for a z-score and halves the bytes scanned; the
+    # reductions still accumulate in float64.
+    amounts = expenses["Amount"].to_numpy(dtype=np.float32)
+    rows = np.arange(len(expenses))
     if "Date" in df.columns:
         cutoff = df["Date"].max() - pd.DateOffset(months=lookback_months)
-        df = df[df["Date"] >= cutoff]
+        rows = np.flatnonzero(expenses["Date"].to_numpy() >= cutoff.to_datetime64())
+        amounts = amounts[rows]
 
-    expenses = df[df["Amount"] < 0].copy()
-    if expenses.empty:
+    if amounts.size == 0:
         return pd.DataFrame()
 
-    std_spend = expenses["Amount"].std(ddof=0)
-    if pd.isna(std_spend) or std_spend == 0:
+    std_spend = amounts.std(dtype=np.float64)
+    if not np.isfinite(std_spend) or std_spend == 0:
         return pd.DataFrame()
 
-    mean_spend = expenses["Amount"].mean()
-    expenses["zscore"] = (expenses["Amount"] - mean_spend) / std_spend
-    anomalies = expenses[expenses["zscore"] < -2].sort_values("zscore")
+    zscores = (amounts - amounts.mean(dtype=np.float64)) / std_spend
+    flagged = zscores < -2
+    anomalies = expenses.iloc[rows[flagged]].assign(zscore=zscores[flagged]).sort_values("zscore")
     return anomalies
 
-def predict_spending(df):
+def predict_spending(df, cache: Optional[InsightsCache] = None):
     """Rolling-average + trend forecast for next month's spending."""
 
     import plotly.express as px
 
-    monthly = (
-        df[df["Amount"] < 0]
-        .groupby("Month")["Amount"]
-        .sum()
-        .abs()
-        .reset_index()
-        .sort_values("Month")
-    )
+    monthly_spend = cache.monthly_spend if cache is not None else _monthly_spend(df[df["Amount"] < 0])
+    monthly = monthly_spend.reset_index().sort_values("Month")
 
     if len(monthly) < 2:
         return {
@@ -96,28 +197,21 @@ def predict_spending(df):
 
     last_month = monthly["Month"].max()
     try:
-        next_month_date = pd.to_datetime(last_month) + pd.DateOffset(months=1)
-        next_month = next_month_date.strftime("%Y-%m")
+        next_month = str(pd.Period(last_month, freq="M") + 1)
     except Exception:
         next_month = "Next Month"
 
-    forecast = pd.DataFrame({
-        "Month": [next_month],
-        "Amount": [forecast_value],
-        "Type": ["Forecast"],
-    })
-
-    monthly["Type"] = "Actual"
-    combined = pd.concat([monthly, forecast])
-
+    # Plot the history as-is and add the forecast as its own trace rather
+    # than concatenating a one-row frame onto a copy of the history.
     fig = px.line(
-        combined,
+        monthly,
         x="Month",
         y="Amount",
-        color="Type",
         markers=True,
         title="Spending Forecast",
     )
+    fig.update_traces(name="Actual", showlegend=True)
+    fig.add_scatter(x=[next_month], y=[forecast_value], mode="markers", name="Forecast")
 
     summary = (
         f"Using a {lookback}-month rolling average with recent trend signals, next month is "
@@ -139,6 +233,7 @@ def generate_actionable_tips(
     forecast: Optional[Dict] = None,
     fixed_expenses_total: float = 0.0,
     window_label: Optional[str] = None,
+    summary: Optional[MonthSummary] = None,
 ):
     """Generates richer, timeframe-aware financial tips."""
     tips = []
@@ -146,8 +241,9 @@ def generate_actionable_tips(
     if df.empty:
         return tips
 
-    current_month = df["Month"].max()
-    month_df = df[df["Month"] == current_month]
+    if summary is None:
+        summary = month_summary(df)
+    current_month = summary.month
 
     # 1. Spending Spikes & pacing vs last month
     try:
@@ -156,25 +252,25 @@ def generate_actionable_tips(
         last_month = None
 
     if last_month:
-        curr_spend = month_df[month_df["Amount"] < 0]["Amount"].sum()
-        last_spend = df[(df["Month"] == last_month) & (df["Amount"] < 0)]["Amount"].sum()
+        curr_spend = summary.expenses
+        last_amounts = _month_rows(df, last_month)["Amount"]
+        last_spend = last_amounts[last_amounts < 0].sum()
         if abs(curr_spend) > abs(last_spend) * 1.2:
             tips.append(
                 "⚠️ **Spending Alert**: You're pacing 20%+ higher than last month. Hold discretionary spend for a week and review big-ticket items."
             )
 
     # 2. High Category Spend vs history
-    cat_spend = month_df.groupby("Category")["Amount"].sum().sort_values()
+    cat_spend = summary.by_category["Amount"].nsmallest(1)
     if not cat_spend.empty:
         top_cat = cat_spend.index[0]
         top_val = abs(cat_spend.iloc[0])
-        trailing = (
-            df[df["Month"] != current_month]
-            .groupby("Category")["Amount"]
-            .mean()
-            .abs()
-        )
-        trailing_avg = trailing.get(top_cat, 0)
+        # Typical spend outside this month: the category's overall totals
+        # minus this month's share, instead of re-filtering every other month.
+        cat_amounts = df["Amount"][df["Category"] == top_cat]
+        prior_rows = cat_amounts.count() - summary.by_category.at[top_cat, "Rows"]
+        prior_total = cat_amounts.sum() - summary.by_category.at[top_cat, "Amount"]
+        trailing_avg = abs(prior_total / prior_rows) if prior_rows > 0 else 0
         if trailing_avg > 0 and top_val > trailing_avg * 1.3:
             tips.append(
                 f"📈 **{top_cat} is trending hot**: ${top_val:,.0f} vs typical ${trailing_avg:,.0f}. Set a cap for the next 7 days."
@@ -205,12 +301,7 @@ def generate_actionable_tips(
             f"🚨 **Unusual charge**: {spike['Description']} on {spike['Date'].date()} for ${abs(spike['Amount']):,.0f}. Verify this transaction."
         )
 
-    dupes = (
-        month_df[month_df["Amount"] < 0]
-        .groupby(["Description", "Amount"])
-        .filter(lambda g: len(g) >= 2)
-        .drop_duplicates(subset=["Description", "Amount"])
-    )
+    dupes = _repeated_charges(summary.expense_rows)
     if not dupes.empty:
         d = dupes.iloc[0]
         tips.append(
@@ -218,8 +309,8 @@ def generate_actionable_tips(
         )
 
     # 5. Savings rate / runway
-    income = month_df[month_df["Amount"] > 0]["Amount"].sum()
-    spend = abs(month_df[month_df["Amount"] < 0]["Amount"].sum())
+    income = summary.income
+    spend = abs(summary.expenses)
     if income > 0:
         savings_rate = (income - spend) / income
         if savings_rate < 0.2:
@@ -273,10 +364,11 @@ def assistant_response(
     anomalies=None,
     tips: Optional[List[str]] = None,
     window_label: Optional[str] = None,
+    summary: Optional[MonthSummary] = None,
 ):
     """Question-aware assistant that cites the most relevant data points."""
 
-    highlights = compute_highlights(df)
+    highlights = compute_highlights(df, summary=summary)
     parts = []
 
     if highlights:
@@ -303,7 +395,7 @@ def assistant_response(
     # Intent-aware follow ups
     lower_q = (query or "").lower()
     if "subscription" in lower_q or "recurring" in lower_q:
-        recurring = df[df["Description"].str.contains("subscr|auto|recurring", case=False, na=False)]
+        recurring = df[df["Description"].str.contains(_RECURRING_RE, na=False)]
         if not recurring.empty:
             total_recurring = recurring[recurring["Amount"] < 0]["Amount"].sum()
             parts.append(
@@ -334,9 +426,13 @@ def filter_by_timeframe(df: pd.DataFrame, window_label: str) -> Tuple[pd.DataFra
     if df.empty:
         return df, (None, None)
 
-    window_df = df.copy()
+    dates = df["Date"]
+    # _prep hands us date-sorted rows, so the window start can be found by
+    # binary search and returned as a slice instead of masking every row.
+    is_sorted = dates.is_monotonic_increasing
+    window_df = df
     start = None
-    end = window_df["Date"].max()
+    end = dates.iloc[-1] if is_sorted else dates.max()
 
     if window_label == "Last 90 days":
         start = end - pd.Timedelta(days=90)
@@ -346,6 +442,9 @@ def filter_by_timeframe(df: pd.DataFrame, window_label: str) -> Tuple[pd.DataFra
         start = pd.Timestamp(pd.Timestamp.today().year, 1, 1)
 
     if start is not None:
-        window_df = window_df[window_df["Date"] >= start]
+        if is_sorted:
+            window_df = df.iloc[dates.searchsorted(start, side="left"):]
+        else:
+            window_df = df[dates >= start]
 
     return window_df, (start, end)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -6,23 +7,28 @@ from pathlib import Path
 import math
 
 def _prep_loans(loans: pd.DataFrame) -> pd.DataFrame:
-    df = loans.copy()
-    df["Date"] = pd.to_datetime(df["Date"])
-    for col in ["Principal","InterestRateAPR","TermMonths","PaymentAmount","Balance"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-    df["LoanType"] = df["LoanType"].fillna("Other").str.title()
+    numeric = {
+        col: pd.to_numeric(loans[col], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+        for col in ["Principal","InterestRateAPR","TermMonths","PaymentAmount","Balance"]
+    }
     # Sanity: effective monthly rate
-    df["RateMonthly"] = (df["InterestRateAPR"]/100.0)/12.0
+    r = (numeric["InterestRateAPR"]/100.0)/12.0
+    bal = numeric["Balance"]
+    pmt = numeric["PaymentAmount"]
     # Simple rough remaining months if PaymentAmount > interest-only
-    def est_remaining_months(r, bal, pmt):
-        if pmt <= r*bal or pmt <= 0 or bal <= 0: return None
-        try:
-            n = -math.log(1 - r*bal/pmt) / math.log(1+r)
-            return max(0, n)
-        except Exception:
-            return None
-    df["EstMonthsLeft"] = df.apply(lambda r: est_remaining_months(r["RateMonthly"], r["Balance"], r["PaymentAmount"]), axis=1)
-    return df
+    valid = (pmt > r*bal) & (pmt > 0) & (bal > 0) & (r > 0)
+    months_left = np.full(len(loans), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        months_left[valid] = -np.log1p(-r[valid]*bal[valid]/pmt[valid]) / np.log1p(r[valid])
+    # Build every cleaned/derived column in one assign instead of copying
+    # the frame and setting columns one at a time.
+    return loans.assign(
+        Date=pd.to_datetime(loans["Date"]),
+        **numeric,
+        LoanType=loans["LoanType"].fillna("Other").str.title().astype("category"),
+        RateMonthly=r,
+        EstMonthsLeft=np.clip(months_left, 0, None),
+    )
 
 def simulate_payoff(balance: float, rate_apr: float, monthly_payment: float, extra_payment: float = 0) -> pd.DataFrame:
     """
@@ -39,28 +45,83 @@ def simulate_payoff(balance: float, rate_apr: float, monthly_payment: float, ext
     if total_payment <= balance * monthly_rate:
         return pd.DataFrame() # Infinite loop prevention
 
-    schedule = []
-    curr_balance = balance
+    # Balance after k payments follows a closed-form geometric recurrence, so
+    # build the whole schedule at once instead of stepping month by month.
+    if monthly_rate > 0:
+        months_needed = math.ceil(
+            math.log(total_payment / (total_payment - balance * monthly_rate)) / math.log1p(monthly_rate)
+        )
+    else:
+        months_needed = math.ceil(balance / total_payment)
+    paid_off = months_needed <= 1200  # Cap at 100 years
+    months = np.arange(1, min(months_needed, 1200) + 1)
+
+    if monthly_rate > 0:
+        growth = (1 + monthly_rate) ** months
+        closing = balance * growth - total_payment * (growth - 1) / monthly_rate
+    else:
+        closing = balance - total_payment * months.astype(float)
+
+    # Guard against the rounded month count overshooting by one
+    cleared = np.flatnonzero(closing <= 0)
+    if cleared.size:
+        months = months[: cleared[0] + 1]
+        closing = closing[: cleared[0] + 1]
+
+    opening = np.concatenate(([balance], closing[:-1]))
+    interest = opening * monthly_rate
+    principal = total_payment - interest
+    payments = np.full(len(months), float(total_payment))
+    if paid_off:
+        # The final payment only covers what is left
+        principal[-1] = opening[-1]
+        payments[-1] = interest[-1] + principal[-1]
+        closing[-1] = 0.0
+
+    return pd.DataFrame({
+        "Month": months,
+        "Balance": np.maximum(closing, 0),
+        "Interest": interest,
+        "Principal": principal,
+        "TotalPayment": payments,
+    })
+
+
+def simulate_avalanche(balances, rates_apr, payments, cap: int = 1200):
+    """
+    Simulates paying several debts with the avalanche method.
+    Debts must be ordered highest APR first. Each month every debt gets its
+    minimum payment and whatever is left of the combined minimums (including
+    minimums freed up by paid-off debts) goes to the highest-APR balance.
+    Returns (balances, interest) arrays shaped (months, debts).
+    """
+    bal = np.array(balances, dtype=float)
+    rates = np.asarray(rates_apr, dtype=float) / 100.0 / 12.0
+    pmts = np.asarray(payments, dtype=float)
+    n_debts = len(bal)
+    budget = pmts.sum()
+
+    balance_rows = np.zeros((cap, n_debts))
+    interest_rows = np.zeros((cap, n_debts))
     month = 0
-    
-    while curr_balance > 0 and month < 1200: # Cap at 100 years
-        month += 1
-        interest = curr_balance * monthly_rate
-        principal = total_payment - interest
-        
-        if principal > curr_balance:
-            principal = curr_balance
-            total_payment = interest + principal
-            
-        curr_balance -= principal
-        schedule.append({
-            "Month": month,
-            "Balance": max(0, curr_balance),
-            "Interest": interest,
-            "Principal": principal,
-            "TotalPayment": total_payment
-        })
-        
-    return pd.DataFrame(schedule)
+    while month < cap and bal.sum() > 0:
+        # Accrue interest and take the minimum payment on every open debt at once
+        active = bal > 0
+        interest = np.where(active, bal * rates, 0.0)
+        due = bal + interest
+        paid = np.where(active, np.minimum(pmts, due), 0.0)
+        bal = np.where(active, due - paid, bal)
+        interest_rows[month] = interest
+        surplus = budget - paid.sum()
+
+        # Cascade the surplus down the APR ordering: each debt absorbs what
+        # is left after the higher-APR debts ahead of it are cleared.
+        if surplus > 0:
+            room = np.maximum(bal, 0.0)
+            ahead = np.cumsum(room) - room
+            bal = bal - np.clip(surplus - ahead, 0.0, room)
 
+        balance_rows[month] = bal
+        month += 1
 
+    return balance_rows[:month], interest_rows[:month]
@@ -1,17 +1,21 @@
 """Lightweight MCP-aligned server exposing finance tools over FastAPI."""
 
+import re
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 from fastapi import Depends, FastAPI
 from pydantic import BaseModel, Field
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from database import FixedExpense, Loan, SessionLocal, Transaction
-from insights import detect_anomalies, predict_spending
-from loans import simulate_payoff
+from insights import detect_anomalies
+from loans import simulate_avalanche, simulate_payoff
 
 MODEL_PATH = Path("personal_finance_tracker/models/transaction_classifier.pkl")
 
@@ -27,23 +31,22 @@ def get_db() -> Session:
 
 
 def transactions_to_df(db: Session) -> pd.DataFrame:
-    txns = db.query(Transaction).all()
-    if not txns:
+    # Select plain column tuples rather than hydrating full ORM objects
+    rows = db.query(Transaction.date, Transaction.amount, Transaction.category, Transaction.description).all()
+    if not rows:
         return pd.DataFrame(columns=["Date", "Amount", "Category", "Description"])
 
+    dates, amounts, categories, descriptions = zip(*rows)
     df = pd.DataFrame(
-        [
-            {
-                "Date": t.date,
-                "Amount": t.amount,
-                "Category": t.category or "Uncategorized",
-                "Description": t.description or "",
-            }
-            for t in txns
-        ]
+        {
+            "Date": pd.to_datetime(dates),
+            "Amount": np.asarray(amounts, dtype=np.float64),
+            "Category": pd.Categorical([c or "Uncategorized" for c in categories]),
+            "Description": pd.Categorical([d or "" for d in descriptions]),
+        }
     )
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.to_period("M").astype(str)
+    df = df.sort_values("Date", kind="stable", ignore_index=True)
+    df["Month"] = df["Date"].dt.to_period("M").astype(str).astype("category").cat.as_ordered()
     return df
 
 
@@ -60,10 +63,20 @@ class PredictCashBalanceResponse(BaseModel):
 
 @app.post("/tools/predict_cash_balance", response_model=PredictCashBalanceResponse)
 async def predict_cash_balance(req: PredictCashBalanceRequest, db: Session = Depends(get_db)):
-    df = transactions_to_df(db)
-    fixed_total = sum(f.amount for f in db.query(FixedExpense).all())
-
-    if df.empty:
+    fixed_total = db.query(func.coalesce(func.sum(FixedExpense.amount), 0.0)).scalar()
+    current_balance = db.query(func.coalesce(func.sum(Transaction.amount), 0.0)).scalar()
+
+    # Let the database collapse the history to the latest 90 daily totals
+    # instead of pulling every transaction into a DataFrame.
+    daily = (
+        db.query(func.sum(Transaction.amount))
+        .filter(Transaction.date.isnot(None))
+        .group_by(Transaction.date)
+        .order_by(Transaction.date.desc())
+        .limit(90)
+        .all()
+    )
+    if not daily:
         return PredictCashBalanceResponse(
             projected_balance=-fixed_total,
             avg_daily_net=0.0,
@@ -71,17 +84,13 @@ async def predict_cash_balance(req: PredictCashBalanceRequest, db: Session = Dep
             fixed_expenses=fixed_total,
         )
 
-    df_sorted = df.sort_values("Date")
-    daily = df_sorted.groupby("Date")["Amount"].sum()
-    daily_window = daily.tail(90)
-    avg_daily_net = daily_window.mean()
-    current_balance = df_sorted["Amount"].sum()
+    avg_daily_net = sum(total for (total,) in daily) / len(daily)
     projected = current_balance + (avg_daily_net * req.period_days) - (fixed_total * req.period_days / 30)
 
     return PredictCashBalanceResponse(
         projected_balance=float(projected),
         avg_daily_net=float(avg_daily_net),
-        sample_days=len(daily_window),
+        sample_days=len(daily),
         fixed_expenses=float(fixed_total),
     )
 
@@ -117,8 +126,12 @@ async def calculate_debt_avalanche(debts: Optional[List[DebtInput]] = None, db:
         months = len(schedule) if not schedule.empty else None
         interest = schedule["Interest"].sum() if not schedule.empty else None
     else:
-        months = None
-        interest = None
+        balances, interest_paid = simulate_avalanche(
+            [d.balance for d in ordered], [d.rate_apr for d in ordered], [d.payment for d in ordered]
+        )
+        paid_off = len(balances) > 0 and not balances[-1].any()
+        months = len(balances) if paid_off else None
+        interest = float(interest_paid.sum()) if paid_off else None
 
     return AvalancheResponse(ordered=[d.lender for d in ordered], months_to_payoff=months, total_interest=interest)
 
@@ -138,9 +151,12 @@ async def get_anomaly_flags(req: AnomalyRequest, db: Session = Depends(get_db)):
     if anomalies.empty:
         return AnomalyResponse(alerts=[])
 
+    top = anomalies.head(5)
     alerts = [
-        f"{row['Date'].date()}: {row['Description']} ${abs(row['Amount']):,.0f} in {row['Category']}"
-        for _, row in anomalies.head(5).iterrows()
+        f"{when.date()}: {description} ${abs(amount):,.0f} in {category}"
+        for when, description, amount, category in zip(
+            top["Date"], top["Description"], top["Amount"], top["Category"]
+        )
     ]
     return AnomalyResponse(alerts=alerts)
 
@@ -173,27 +189,37 @@ class CategorizeResponse(BaseModel):
     confidence: float
 
 
+# Keyword fallback used when no trained model is on disk. All keywords are
+# matched in one scan; the earliest one in the description wins.
+_KEYWORD_CATEGORIES = {
+    "grocery": "Groceries",
+    "uber": "Transport",
+    "lyft": "Transport",
+    "rent": "Rent",
+    "mortgage": "Rent",
+    "coffee": "Dining",
+    "restaurant": "Dining",
+    "netflix": "Subscriptions",
+}
+_KEYWORD_RE = re.compile("|".join(map(re.escape, _KEYWORD_CATEGORIES)))
+
+
+@lru_cache(maxsize=1)
+def _load_classifier(mtime: float):
+    """Unpickle the classifier once; a new mtime (retrained model) reloads it."""
+    return pd.read_pickle(MODEL_PATH)
+
+
 @app.post("/tools/categorize_transaction", response_model=CategorizeResponse)
 async def categorize_transaction(req: CategorizeRequest):
     if MODEL_PATH.exists():
-        model = pd.read_pickle(MODEL_PATH)
+        model = _load_classifier(MODEL_PATH.stat().st_mtime)
         category = model.predict([req.description])[0]
         return CategorizeResponse(category=str(category), confidence=0.72)
 
-    keywords = {
-        "grocery": "Groceries",
-        "uber": "Transport",
-        "lyft": "Transport",
-        "rent": "Rent",
-        "mortgage": "Rent",
-        "coffee": "Dining",
-        "restaurant": "Dining",
-        "netflix": "Subscriptions",
-    }
-    lowered = req.description.lower()
-    for key, cat in keywords.items():
-        if key in lowered:
-            return CategorizeResponse(category=cat, confidence=0.35)
+    match = _KEYWORD_RE.search(req.description.lower())
+    if match:
+        return CategorizeResponse(category=_KEYWORD_CATEGORIES[match.group()], confidence=0.35)
 
     return CategorizeResponse(category="Uncategorized", confidence=0.1)
 
@@ -1,6 +1,12 @@
 import os
 import datetime
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import plaid
+import urllib3
 from plaid.api import plaid_api
 from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
@@ -15,6 +21,20 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Recent /transactions/sync responses keyed by (token hash, cursor), so
+# repeat renders within a minute don't hit Plaid again.
+SYNC_CACHE_TTL = 60
+SYNC_CACHE_MAXSIZE = 256
+_sync_cache = {}
+_sync_cache_lock = threading.Lock()
+
+# Plaid calls are blocking I/O, so syncs for several items fan out on threads
+_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="plaid-sync")
+
+# Backoff for Plaid rate-limit (429) responses
+RATE_LIMIT_ATTEMPTS = 5
+RATE_LIMIT_BACKOFF_MAX = 30
+
 # --- Plaid Client Setup ---
 PLAID_CLIENT_ID = os.getenv('PLAID_CLIENT_ID')
 PLAID_SECRET = os.getenv('PLAID_SECRET')
@@ -38,6 +58,11 @@ else:
             'secret': PLAID_SECRET,
         }
     )
+    # Keep a shared pool of keep-alive connections so concurrent sessions and
+    # follow-up sync calls reuse TLS connections instead of re-handshaking.
+    # urllib3 only replays failed connects here since Plaid calls are POSTs.
+    configuration.connection_pool_maxsize = 32
+    configuration.retries = urllib3.Retry(total=3, backoff_factor=0.5)
     api_client = plaid.ApiClient(configuration)
     client = plaid_api.PlaidApi(api_client)
 
@@ -70,24 +95,115 @@ def exchange_public_token(public_token: str):
     response = client.item_public_token_exchange(request)
     return response['access_token'], response['item_id']
 
+def _is_rate_limited(exc) -> bool:
+    return getattr(exc, "status", None) == 429 or "RATE_LIMIT" in str(getattr(exc, "body", "") or "")
+
+def _call_with_backoff(call, request):
+    """
+    Calls a Plaid endpoint, retrying rate-limited responses with exponential
+    backoff plus jitter. Other errors, and the last failure, are re-raised.
+    """
+    for attempt in range(RATE_LIMIT_ATTEMPTS):
+        try:
+            return call(request)
+        except plaid.ApiException as exc:
+            if not _is_rate_limited(exc) or attempt == RATE_LIMIT_ATTEMPTS - 1:
+                raise
+            _backoff_sleep(attempt)
+
+def _backoff_sleep(attempt: int):
+    # Exponential backoff capped at RATE_LIMIT_BACKOFF_MAX, plus jitter
+    delay = min(2 ** attempt, RATE_LIMIT_BACKOFF_MAX)
+    time.sleep(delay + random.uniform(0, 1))
+
+def _sync_cache_key(access_token: str, cursor: str = None):
+    # Hash the token so raw access tokens are not kept around in memory
+    token_hash = hashlib.blake2b(access_token.encode(), digest_size=16).hexdigest()
+    return token_hash, cursor
+
 def fetch_transactions(access_token: str, cursor: str = None):
     """
     Fetches new transactions using the /transactions/sync endpoint.
+    Responses are reused for SYNC_CACHE_TTL seconds per (token, cursor).
     """
     if not client:
         raise ValueError("Plaid credentials not set in .env")
 
-    sync_request = TransactionsSyncRequest(
-        access_token=access_token,
-        count=100,
-        cursor=cursor,
-        options=TransactionsSyncRequestOptions(
-            include_personal_finance_category=True
-        ),
-    )
+    key = _sync_cache_key(access_token, cursor)
+    now = time.monotonic()
+    with _sync_cache_lock:
+        hit = _sync_cache.get(key)
+        if hit is not None and now - hit[0] < SYNC_CACHE_TTL:
+            return hit[1]
+
+    sync_data = _fetch_transactions(access_token, cursor)
+
+    # Don't pin an empty initial sync; the next call should ask Plaid again
+    if cursor is None and not sync_data.get("added"):
+        return sync_data
+
+    with _sync_cache_lock:
+        if len(_sync_cache) >= SYNC_CACHE_MAXSIZE:
+            expired = [k for k, (stamp, _) in _sync_cache.items() if now - stamp >= SYNC_CACHE_TTL]
+            for k in expired or [min(_sync_cache, key=lambda cached: _sync_cache[cached][0])]:
+                del _sync_cache[k]
+        _sync_cache[key] = (now, sync_data)
+    return sync_data
 
-    sync_response = client.transactions_sync(sync_request)
-    sync_data = sync_response.to_dict() if hasattr(sync_response, "to_dict") else sync_response
+def fetch_transactions_many(requests):
+    """
+    Runs fetch_transactions for several (access_token, cursor) pairs
+    concurrently and returns the responses in the same order.
+    """
+    futures = [_fetch_executor.submit(fetch_transactions, token, cursor) for token, cursor in requests]
+    return [future.result() for future in futures]
+
+def _sync_all_pages(access_token: str, cursor: str = None):
+    """
+    Follows has_more through /transactions/sync, returning one combined response.
+    """
+    added, modified, removed = [], [], []
+    page_cursor = cursor
+    while True:
+        sync_request = TransactionsSyncRequest(
+            access_token=access_token,
+            count=100,
+            cursor=page_cursor,
+            options=TransactionsSyncRequestOptions(
+                include_personal_finance_category=True
+            ),
+        )
+        sync_response = _call_with_backoff(client.transactions_sync, sync_request)
+        page = sync_response.to_dict() if hasattr(sync_response, "to_dict") else sync_response
+
+        added.extend(page.get("added") or [])
+        modified.extend(page.get("modified") or [])
+        removed.extend(page.get("removed") or [])
+        page_cursor = page.get("next_cursor", page_cursor)
+        if not page.get("has_more"):
+            break
+
+    page.update(added=added, modified=modified, removed=removed, next_cursor=page_cursor, has_more=False)
+    return page
+
+def _fetch_transactions(access_token: str, cursor: str = None):
+    """
+    Uncached, fully paginated sync with the /transactions/get fallback.
+    """
+    # Drain every page here so consecutive pages reuse the pooled connection
+    # instead of bouncing back through the caller for each has_more.
+    for attempt in range(RATE_LIMIT_ATTEMPTS):
+        try:
+            sync_data = _sync_all_pages(access_token, cursor)
+            break
+        except plaid.ApiException as exc:
+            # Plaid asks to restart from the original cursor if the item
+            # changed mid-pagination; back off like a rate limit and give up
+            # after the same number of attempts.
+            mutated = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" in str(getattr(exc, "body", "") or "")
+            if not mutated or attempt == RATE_LIMIT_ATTEMPTS - 1:
+                raise
+            _backoff_sleep(attempt)
 
     # Sandbox can occasionally return an empty initial sync; fall back to transactions/get
     if not sync_data.get("added") and cursor is None:
@@ -103,7 +219,7 @@ def fetch_transactions(access_token: str, cursor: str = None):
                 include_personal_finance_category=True,
             ),
         )
-        get_response = client.transactions_get(get_request)
+        get_response = _call_with_backoff(client.transactions_get, get_request)
         get_data = get_response.to_dict() if hasattr(get_response, "to_dict") else get_response
 
         sync_data["added"] = get_data.get("transactions", [])
@@ -10,12 +10,18 @@ from __future__ import annotations
 
 import argparse
 import glob
+import importlib.util
 import os
-import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 
+import joblib
+import numpy as np
 import pandas as pd
+from sklearn import config_context
 from sqlalchemy.orm import Session
 from database import Transaction, SessionLocal
 
@@ -24,6 +30,23 @@ DESCRIPTION_PATTERNS = ["description", "details", "name", "memo", "transaction",
 DATE_PATTERNS = ["date", "transaction date", "posted", "post date", "value date"]
 AMOUNT_PATTERNS = ["amount", "debit", "credit", "amount $", "amt", "withdrawal", "deposit"]
 
+# Amount cleanup: strip currency symbols/commas, "(12.34)" -> "-12.34"
+_CURRENCY_RE = re.compile(r"[\$,]")
+_PAREN_RE = re.compile(r"\((.*?)\)")
+
+# Predict in slices above this many rows so TF-IDF never builds one huge
+# sparse matrix for the whole upload.
+PREDICT_BATCH_THRESHOLD = 200_000
+PREDICT_BATCH_SIZE = 100_000
+
+# CSVs above this size are parsed in row chunks instead of all at once
+CSV_STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+CSV_CHUNK_ROWS = 50_000
+
+# Faster parsers when they are installed; pandas' defaults otherwise.
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else None
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
 def infer_column(df: pd.DataFrame, patterns: list[str]) -> Optional[str]:
     for pattern in patterns:
         for col in df.columns:
@@ -33,16 +56,33 @@ def infer_column(df: pd.DataFrame, patterns: list[str]) -> Optional[str]:
 
 def parse_statement(path: Path) -> Optional[pd.DataFrame]:
     try:
+        if path.suffix.lower() == ".csv" and path.stat().st_size > CSV_STREAM_THRESHOLD_BYTES:
+            return _parse_csv_in_chunks(path)
         if path.suffix.lower() == ".csv":
-            df = pd.read_csv(path)
+            df = pd.read_csv(path, engine=CSV_ENGINE)
         elif path.suffix.lower() in (".xls", ".xlsx"):
-            df = pd.read_excel(path)
+            df = pd.read_excel(path, engine=EXCEL_ENGINE)
         else:
             return None
     except Exception as exc:
         print(f"Failed to read {path}: {exc}")
         return None
 
+    return standardize_statement(df)
+
+def _parse_csv_in_chunks(path: Path) -> Optional[pd.DataFrame]:
+    # Only the three standardized columns of each chunk are kept, so peak
+    # memory tracks the chunk size rather than the raw file. The pyarrow
+    # engine can't stream, so this uses pandas' C reader.
+    parts = []
+    for chunk in pd.read_csv(path, chunksize=CSV_CHUNK_ROWS):
+        part = standardize_statement(chunk)
+        if part is not None:
+            parts.append(part)
+    return pd.concat(parts, ignore_index=True) if parts else None
+
+def standardize_statement(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Map a raw statement frame onto Date/Description/Amount columns."""
     if df.empty:
         return None
 
@@ -63,7 +103,12 @@ def parse_statement(path: Path) -> Optional[pd.DataFrame]:
             credit_col = c
     
     out = pd.DataFrame()
-    out["Date"] = pd.to_datetime(df[date_col], errors="coerce")
+    # Infer one format from the data (fast, cached per unique string); only
+    # fall back to per-value parsing when that leaves most dates unparsed.
+    dates = pd.to_datetime(df[date_col], errors="coerce", cache=True)
+    if dates.isna().mean() > 0.5:
+        dates = pd.to_datetime(df[date_col], errors="coerce", format="mixed", cache=True)
+    out["Date"] = dates
     out["Description"] = df[desc_col].astype(str)
 
     if debit_col is not None and credit_col is not None:
@@ -71,68 +116,109 @@ def parse_statement(path: Path) -> Optional[pd.DataFrame]:
         credit = pd.to_numeric(df[credit_col], errors="coerce").fillna(0)
         out["Amount"] = credit - debit
     else:
-        amt_series = df[amount_col].astype(str).str.replace(r"[\$,]", "", regex=True)
-        amt_series = amt_series.str.replace(r"\((.*?)\)", r"-\1", regex=True)
+        amt_series = df[amount_col].astype(str).str.replace(_CURRENCY_RE, "", regex=True)
+        amt_series = amt_series.str.replace(_PAREN_RE, r"-\1", regex=True)
         out["Amount"] = pd.to_numeric(amt_series, errors="coerce").fillna(0)
 
     out = out.dropna(subset=["Date", "Description"])
     return out
 
 def load_model(model_path: str):
-    with open(model_path, "rb") as f:
-        model = pickle.load(f)
-    return model
+    return _load_model(str(model_path), os.path.getmtime(model_path))
+
+@lru_cache(maxsize=1)
+def _load_model(model_path: str, mtime: float):
+    """Load once per file version; arrays saved with joblib.dump are memory-mapped."""
+    return joblib.load(model_path, mmap_mode="r")
 
 def classify_transactions(df: pd.DataFrame, model) -> pd.DataFrame:
+    """Adds a predicted Category column to ``df`` in place and returns it."""
     if df.empty:
         return df
-    X = df["Description"].astype(str)
-    predicted = model.predict(X)
-    df = df.copy()
+    # One vectorized predict over the combined frame (never per file)
+    X = df["Description"].astype(str).to_numpy()
+    # TF-IDF output is always finite, so skip sklearn's NaN/inf sweep
+    with config_context(assume_finite=True):
+        if len(X) > PREDICT_BATCH_THRESHOLD:
+            chunks = np.array_split(X, len(X) // PREDICT_BATCH_SIZE)
+            predicted = np.concatenate([model.predict(chunk) for chunk in chunks])
+        else:
+            predicted = model.predict(X)
     df["Category"] = predicted
     return df
 
 def process_files(files: List[Path], model_path: str) -> pd.DataFrame:
     """Process a list of file paths and return a categorized DataFrame."""
     model = load_model(model_path)
-    all_rows = []
-    for file in files:
-        df = parse_statement(file)
-        if df is not None:
-            all_rows.append(df)
+    paths = [Path(f) for f in files]
+    if len(paths) > 1:
+        # Read files on threads: the CSV/Excel readers spend much of their
+        # time outside the GIL. A process pool is avoided because this runs
+        # inside Streamlit, where spawned workers would re-run the app script
+        # and forking would inherit the locks of its threads.
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as ex:
+            parsed = list(ex.map(parse_statement, paths))
+    else:
+        parsed = [parse_statement(p) for p in paths]
+    all_rows = [df for df in parsed if df is not None]
 
     if not all_rows:
         return pd.DataFrame()
 
     combined = pd.concat(all_rows, ignore_index=True)
-    combined = combined.drop_duplicates(subset=["Date", "Description", "Amount"])
-    combined = combined.sort_values("Date")
+    # Dedupe on one uint64 row hash instead of hashing three columns as
+    # objects; "+ 0.0" folds -0.0 into 0.0 so they still count as equal.
+    keys = combined[["Date", "Description"]].assign(Amount=combined["Amount"] + 0.0)
+    row_hash = pd.util.hash_pandas_object(keys, index=False)
+    combined = combined[~row_hash.duplicated().to_numpy()]
+    combined = combined.sort_values("Date", kind="stable")
 
     categorized = classify_transactions(combined, model)
     return categorized
 
 def save_to_db(df: pd.DataFrame, db: Session):
     """Saves the DataFrame to the database, avoiding duplicates."""
-    count = 0
-    for _, row in df.iterrows():
-        # Check for existing transaction (simple check by date, desc, amount)
-        # In a real app, we'd want a more robust ID or hash.
-        exists = db.query(Transaction).filter(
-            Transaction.date == row["Date"].date(),
-            Transaction.description == row["Description"],
-            Transaction.amount == row["Amount"]
-        ).first()
-        
-        if not exists:
-            txn = Transaction(
-                date=row["Date"].date(),
-                description=row["Description"],
-                amount=row["Amount"],
-                category=row["Category"],
-                source="csv_upload",
-                is_shared=False # Default to private
-            )
-            db.add(txn)
-            count += 1
+    if df.empty:
+        return 0
+
+    dates = df["Date"].dt.date
+    # Fetch the existing (date, desc, amount) keys for the statement's date
+    # range in one query instead of checking every row separately.
+    # In a real app, we'd want a more robust ID or hash.
+    existing = set(
+        db.query(Transaction.date, Transaction.description, Transaction.amount)
+        .filter(Transaction.date.between(dates.min(), dates.max()))
+        .all()
+    )
+
+    is_new = [
+        (date, desc, amount) not in existing
+        for date, desc, amount in zip(dates, df["Description"], df["Amount"])
+    ]
+    new_rows = pd.DataFrame(
+        {
+            "date": dates[is_new],
+            "description": df["Description"][is_new],
+            "amount": df["Amount"][is_new],
+            "category": df["Category"][is_new],
+            # Spell out the model defaults; to_sql bypasses the ORM
+            "confidence_score": 1.0,
+            "is_reviewed": True,
+            "source": "csv_upload",
+            "is_shared": False, # Default to private
+        }
+    )
+
+    # Multi-row INSERTs on the session's connection, so the rows land in
+    # the same transaction; 100 rows x 8 columns stays under SQLite's
+    # bound-parameter limit.
+    new_rows.to_sql(
+        Transaction.__tablename__,
+        con=db.connection(),
+        if_exists="append",
+        index=False,
+        method="multi",
+        chunksize=100,
+    )
     db.commit()
-    return count
\ No newline at end of file
+    return len(new_rows)
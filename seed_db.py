@@ -1,6 +1,10 @@
 import bcrypt
 from database import init_db, SessionLocal, User
 
+# Seed accounts only need a valid hash; bcrypt.checkpw reads the cost from
+# the hash itself, so a lower cost than the default 12 logs in the same way.
+SEED_BCRYPT_ROUNDS = 10
+
 def seed_users():
     init_db()
     db = SessionLocal()
@@ -12,11 +16,11 @@ def seed_users():
         return
 
     # Admin User
-    admin_pw = bcrypt.hashpw(b"admin123", bcrypt.gensalt()).decode('utf-8')
+    admin_pw = bcrypt.hashpw(b"admin123", bcrypt.gensalt(rounds=SEED_BCRYPT_ROUNDS)).decode('utf-8')
     admin = User(username="admin", password_hash=admin_pw, role="admin")
     
     # Family User (Brother)
-    family_pw = bcrypt.hashpw(b"brother123", bcrypt.gensalt()).decode('utf-8')
+    family_pw = bcrypt.hashpw(b"brother123", bcrypt.gensalt(rounds=SEED_BCRYPT_ROUNDS)).decode('utf-8')
     family = User(username="brother", password_hash=family_pw, role="family")
     
     db.add(admin)